@@ -34,11 +34,12 @@ class App(object):
             msg_body = json.dumps(body)
             response = _http.post(url, msg_body, headers, verify_peer)
 
-            if response.status_code is not 200:
+            if response.status_code != 200:
                 raise ApiCallError('http status code is {0} in send.'.format(response.status_code))
 
-            # json text to dict
-            resp_dict = json.loads(response.text)
+            # json bytes to dict; parsing the raw body directly avoids having requests guess the
+            # text encoding of every response
+            resp_dict = json.loads(response.content)
             return resp_dict
 
         except Exception as e:
@@ -57,10 +58,10 @@ class App(object):
         self.access_token = None
         self.token_server = token_server
         self.push_open_url = push_open_url
-        self.hw_push_server = self.push_open_url + "/v1/{0}/messages:send"
-        self.hw_push_topic_sub_server = self.push_open_url + "/v1/{0}/topic:subscribe"
-        self.hw_push_topic_unsub_server = self.push_open_url + "/v1/{0}/topic:unsubscribe"
-        self.hw_push_topic_query_server = self.push_open_url + "/v1/{0}/topic:list"
+        self.hw_push_server = "{0}/v1/{1}/messages:send".format(self.push_open_url, self.appid_push)
+        self.hw_push_topic_sub_server = "{0}/v1/{1}/topic:subscribe".format(self.push_open_url, self.appid_push)
+        self.hw_push_topic_unsub_server = "{0}/v1/{1}/topic:unsubscribe".format(self.push_open_url, self.appid_push)
+        self.hw_push_topic_query_server = "{0}/v1/{1}/topic:list".format(self.push_open_url, self.appid_push)
 
     def _refresh_token(self, verify_peer=False):
         """refresh access token
@@ -81,11 +82,11 @@ class App(object):
         try:
             response = _http.post(self.token_server, msg_body, headers, verify_peer=verify_peer)
 
-            if response.status_code is not 200:
+            if response.status_code != 200:
                 return False, 'http status code is {0} in get access token'.format(response.status_code)
 
             """ json string to directory """
-            response_body = json.loads(response.text)
+            response_body = json.loads(response.content)
 
             self.access_token = response_body.get('access_token')
             self.token_expired_time = int(round(time.time() * 1000)) + (int(response_body.get('expires_in')) - 5 * 60) * 1000
@@ -134,7 +135,7 @@ class App(object):
         verify_peer = kwargs['verify_peer']
         self._update_token(verify_peer)
         headers = self._create_header()
-        url = self.hw_push_server.format(self.appid_push)
+        url = self.hw_push_server
         msg_body_dict = dict()
         msg_body_dict['validate_only'] = validate_only
         msg_body_dict['message'] = App.JSON_ENCODER.default(message)
@@ -149,7 +150,7 @@ class App(object):
         """
         self._update_token()
         headers = self._create_header()
-        url = self.hw_push_topic_sub_server.format(self.appid_push)
+        url = self.hw_push_topic_sub_server
         msg_body_dict = {'topic': topic, 'tokenArray': token_list}
         return App._send_to_server(headers, msg_body_dict, url)
 
@@ -162,7 +163,7 @@ class App(object):
         """
         self._update_token()
         headers = self._create_header()
-        url = self.hw_push_topic_unsub_server.format(self.appid_push)
+        url = self.hw_push_topic_unsub_server
         msg_body_dict = {'topic': topic, 'tokenArray': token_list}
         return App._send_to_server(headers, msg_body_dict, url)
 
@@ -173,7 +174,7 @@ class App(object):
         """
         self._update_token()
         headers = self._create_header()
-        url = self.hw_push_topic_query_server.format(self.appid_push)
+        url = self.hw_push_topic_query_server
         msg_body_dict = {'token': token}
         return App._send_to_server(headers, msg_body_dict, url)
 
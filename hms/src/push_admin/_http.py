@@ -15,6 +15,12 @@
 # limitations under the License.
 
 import requests
+from requests.adapters import HTTPAdapter
+
+# Shared session so that repeated posts to the same HCM endpoints (token server, push server) reuse
+# pooled keep-alive connections rather than paying a new TCP + TLS handshake for every message.
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
 
 
 def post(url, req_body, headers=None, verify_peer=False):
@@ -30,7 +36,7 @@ def post(url, req_body, headers=None, verify_peer=False):
             fali return None
     """
     try:
-        response = requests.post(url, data=req_body, headers=headers, timeout=10, verify=verify_peer)
+        response = _session.post(url, data=req_body, headers=headers, timeout=10, verify=verify_peer)
         return response
 
     except Exception as e:
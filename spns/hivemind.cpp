@@ -5,6 +5,8 @@
 #include <oxenc/bt_producer.h>
 #include <oxenc/bt_serialize.h>
 #include <oxenmq/batch.h>
+#include <sodium/core.h>
+#include <sodium/runtime.h>
 #include <spdlog/common.h>
 #include <systemd/sd-daemon.h>
 
@@ -40,9 +42,32 @@ static void omq_log(oxenmq::LogLevel level, const char* file, int line, std::str
 
 std::atomic<int> next_hivemind_id{1};
 
+// Statements that run for every incoming message notification get prepared once on each new
+// database connection so that postgresql doesn't have to re-parse and re-plan them every time.
+static void prepare_statements(pqxx::connection& conn) {
+    conn.prepare("notify_subscriptions", R"(
+SELECT want_data, enc_key, service, svcid, svcdata FROM subscriptions
+WHERE account = $1
+    AND EXISTS(SELECT 1 FROM sub_namespaces WHERE subscription = id AND namespace = $2))");
+
+    // Stats upserts: every notifier reports a handful of these every few seconds.
+    conn.prepare("set_stat_str", R"(
+INSERT INTO service_stats (service, name, val_str) VALUES ($1, $2, $3)
+ON CONFLICT (service, name) DO UPDATE
+    SET val_str = EXCLUDED.val_str, val_int = NULL)");
+    conn.prepare("set_stat_int", R"(
+INSERT INTO service_stats (service, name, val_int) VALUES ($1, $2, $3)
+ON CONFLICT (service, name) DO UPDATE
+    SET val_str = NULL, val_int = EXCLUDED.val_int)");
+    conn.prepare("increment_stat", R"(
+INSERT INTO service_stats (service, name, val_int) VALUES ($1, $2, $3)
+ON CONFLICT (service, name) DO UPDATE
+    SET val_str = NULL, val_int = COALESCE(service_stats.val_int, 0) + EXCLUDED.val_int)");
+}
+
 HiveMind::HiveMind(Config conf_in) :
         config{std::move(conf_in)},
-        pool_{config.pg_connect},
+        pool_{config.pg_connect, 1, prepare_statements},
         omq_{std::string{config.pubkey.sv()},
              std::string{config.privkey.sv()},
              false,
@@ -52,6 +77,24 @@ HiveMind::HiveMind(Config conf_in) :
 
     fiddle_rlimit_nofile();
 
+    if (sodium_init() < 0)
+        throw std::runtime_error{"Failed to initialize libsodium"};
+
+#if defined(__x86_64__) || defined(__i386__)
+    // libsodium picks its blake2b implementation at runtime from the CPU features available,
+    // silently falling back to slower code without them, so make that visible.
+    if (!sodium_runtime_has_ssse3())
+        log::warning(
+                cat,
+                "CPU lacks SSSE3 support; libsodium will use its slower portable blake2b "
+                "implementation");
+    else if (!sodium_runtime_has_avx2())
+        log::warning(
+                cat,
+                "CPU lacks AVX2 support; libsodium will use its SSSE3/SSE4.1 blake2b "
+                "implementation");
+#endif
+
     sd_notify(0, "STATUS=Initializing OxenMQ");
 
     // Ignore debugging and below; get everything else and let our logger filter it
@@ -501,35 +544,14 @@ void HiveMind::on_reg_service(oxenmq::Message& m) {
 
 static void set_stat(
         pqxx::work& tx, std::string_view service, std::string_view name, std::string_view val) {
-    tx.exec_params0(
-            R"(
-INSERT INTO service_stats (service, name, val_str) VALUES ($1, $2, $3)
-ON CONFLICT (service, name) DO UPDATE
-    SET val_str = EXCLUDED.val_str, val_int = NULL)",
-            service,
-            name,
-            val);
+    tx.exec_prepared0("set_stat_str", service, name, val);
 }
 static void set_stat(pqxx::work& tx, std::string_view service, std::string_view name, int64_t val) {
-    tx.exec_params0(
-            R"(
-INSERT INTO service_stats (service, name, val_int) VALUES ($1, $2, $3)
-ON CONFLICT (service, name) DO UPDATE
-    SET val_str = NULL, val_int = EXCLUDED.val_int)",
-            service,
-            name,
-            val);
+    tx.exec_prepared0("set_stat_int", service, name, val);
 }
 static void increment_stat(
         pqxx::work& tx, std::string_view service, std::string_view name, int64_t incr) {
-    tx.exec_params0(
-            R"(
-INSERT INTO service_stats (service, name, val_int) VALUES ($1, $2, $3)
-ON CONFLICT (service, name) DO UPDATE
-    SET val_str = NULL, val_int = COALESCE(service_stats.val_int, 0) + EXCLUDED.val_int)",
-            service,
-            name,
-            incr);
+    tx.exec_prepared0("increment_stat", service, name, incr);
 }
 
 extern "C" inline void message_buffer_destroy(void*, void* hint) {
@@ -673,13 +695,7 @@ void HiveMind::process_notifications() {
                     notifies;
             std::vector<Blake2B_32> filter_vals;
 
-            auto result = tx.exec_params(
-                    R"(
-SELECT want_data, enc_key, service, svcid, svcdata FROM subscriptions
-WHERE account = $1
-    AND EXISTS(SELECT 1 FROM sub_namespaces WHERE subscription = id AND namespace = $2))",
-                    account,
-                    ns);
+            auto result = tx.exec_prepared("notify_subscriptions", account, ns);
             notifies.reserve(result.size());
             filter_vals.reserve(result.size());
             for (auto row : result) {
@@ -797,6 +813,9 @@ void HiveMind::on_service_stats(oxenmq::Message& m) {
     try {
         auto conn = pool_.get();
         pqxx::work tx{conn};
+        // These stats get rewritten by every notifier every few seconds and losing the last few
+        // updates in a crash is harmless, so don't make each one wait for a WAL flush to disk.
+        tx.exec0("SET LOCAL synchronous_commit = off");
         oxenc::bt_dict_consumer dict{m.data[1]};
 
         set_stat(tx, "", "last.{}"_format(service), unix_timestamp());
@@ -1659,7 +1678,7 @@ bool HiveMind::add_subscription(
     auto conn = pool_.get();
     pqxx::work tx{conn};
 
-    auto result = tx.query01<int64_t, int64_t, Int16ArrayLoader>(
+    auto result = tx.exec_params(
             R"(
 SELECT
     id,
@@ -1667,11 +1686,18 @@ SELECT
     ARRAY(SELECT namespace FROM sub_namespaces WHERE subscription = id ORDER BY namespace)
 FROM subscriptions
 WHERE
-    account = {} AND service = {} AND svcid = {})"_format(
-                    tx.quote(pubkey.id), tx.quote(service), tx.quote(service_id)));
+    account = $1 AND service = $2 AND svcid = $3)",
+            pubkey.id,
+            service,
+            service_id);
+    // Postgres array literal of the subscription's namespaces, e.g. `{-400,0,1}`, so that we can
+    // diff and insert the namespace rows in a single statement each rather than row-by-row.
+    auto ns_array = "{{{}}}"_format(fmt::join(sub.namespaces, ","));
     int64_t id;
-    if (result) {
-        auto& [row_id, sig_ts, ns_arr] = *result;
+    if (!result.empty()) {
+        std::tuple<int64_t, int64_t, Int16ArrayLoader> existing;
+        result[0].to(existing);
+        auto& [row_id, sig_ts, ns_arr] = existing;
         id = row_id;
 
         insert_ns = ns_arr.a != sub.namespaces;
@@ -1692,7 +1718,13 @@ WHERE id = $1
                 enc_key,
                 service_data);
         if (insert_ns)
-            tx.exec_params0("DELETE FROM sub_namespaces WHERE subscription = $1", id);
+            // Only drop the namespaces that are no longer wanted; any that we keep stay as-is and
+            // get skipped by the ON CONFLICT in the insert below.
+            tx.exec_params0(
+                    R"(
+DELETE FROM sub_namespaces WHERE subscription = $1 AND namespace <> ALL($2::SMALLINT[]))",
+                    id,
+                    ns_array);
     } else {
         new_sub = true;
         log::trace(cat, "inserting new subscription for {}", pubkey.id.hex());
@@ -1720,11 +1752,12 @@ RETURNING id
     }
 
     if (insert_ns)
-        for (auto n : sub.namespaces)
-            tx.exec_params0(
-                    R"(INSERT INTO sub_namespaces (subscription, namespace) VALUES ($1, $2))",
-                    id,
-                    n);
+        tx.exec_params0(
+                R"(
+INSERT INTO sub_namespaces (subscription, namespace) SELECT $1, UNNEST($2::SMALLINT[])
+ON CONFLICT DO NOTHING)",
+                id,
+                ns_array);
 
     for (const auto& s : {""s, service})
         increment_stat(tx, s, new_sub ? "subscription" : "sub_renew", 1);
@@ -102,7 +102,10 @@ class APNSHandler:
         self.service_name = service_name
         conf = config.NOTIFY[service_name]
         self.apns = aioapns.APNs(
-            client_cert=conf["cert_file"], use_sandbox=sandbox, topic=conf["identifier"]
+            client_cert=conf["cert_file"],
+            use_sandbox=sandbox,
+            topic=conf["identifier"],
+            max_connections=int(conf.get("max_connections", 10)),
         )
 
         self.omq.send(self.hivemind, "admin.register_service", service_name)
@@ -36,6 +36,9 @@ SPNS_FIREBASE_VERSION = 1
 # "too big" response in the metadata instead of including the message.
 MAX_MSG_SIZE = 2500
 
+# Android config for all our notifications:
+ANDROID_CONFIG = messaging.AndroidConfig(priority="high")
+
 # Firebase max simultaneous notifications:
 MAX_NOTIFIES = 500
 
@@ -76,7 +79,7 @@ def push_notification(msg: Message):
     msg = messaging.Message(
         data={"enc_payload": oxenc.to_base64(enc_payload), "spns": f"{SPNS_FIREBASE_VERSION}"},
         token=device_token,
-        android=messaging.AndroidConfig(priority="high"),
+        android=ANDROID_CONFIG,
     )
 
     global notify_queue, queue_lock
@@ -90,16 +93,15 @@ def send_pending():
     with queue_lock:
         queue, notify_queue = notify_queue, []
 
-    i = 0
-    while i < len(queue):
-        results = messaging.send_all(messages=queue[i : i + MAX_NOTIFIES], app=firebase_app)
+    for i in range(0, len(queue), MAX_NOTIFIES):
+        batch = queue[i : i + MAX_NOTIFIES]
+        results = messaging.send_all(messages=batch, app=firebase_app)
         with stats.lock:
-            stats.notifies += min(len(queue) - i, MAX_NOTIFIES)
+            stats.notifies += results.success_count
+            stats.failures += results.failure_count
 
         # FIXME: process/reschedule failures?
 
-        i += MAX_NOTIFIES
-
 
 @warn_on_except
 def ping():
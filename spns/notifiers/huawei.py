@@ -35,8 +35,10 @@ SPNS_HUAWEI_VERSION = 1
 # "too big" response in the metadata instead of including the message.
 MAX_MSG_SIZE = 2500
 
-# Firebase max simultaneous notifications:
-MAX_NOTIFIES = 500
+# Android config for all our notifications:
+ANDROID_CONFIG = huawei_messaging.AndroidConfig(
+    urgency=huawei_messaging.AndroidConfig.HIGH_PRIORITY
+)
 
 
 stats = NotifyStats()
@@ -77,9 +79,7 @@ def push_notification(msg: Message):
             {"enc_payload": oxenc.to_base64(enc_payload), "spns": f"{SPNS_HUAWEI_VERSION}"}
         ),
         token=[device_token],
-        android=huawei_messaging.AndroidConfig(
-            urgency=huawei_messaging.AndroidConfig.HIGH_PRIORITY
-        ),
+        android=ANDROID_CONFIG,
     )
 
     global notify_queue, queue_lock
@@ -93,16 +93,13 @@ def send_pending():
     with queue_lock:
         queue, notify_queue = notify_queue, []
 
-    i = 0
-    while i < len(queue):
-        result = huawei_messaging.send_message(queue[i], verify_peer=True)
+    for msg in queue:
+        result = huawei_messaging.send_message(msg, verify_peer=True)
         with stats.lock:
             stats.notifies += 1
 
         # FIXME: process/reschedule failures?
 
-        i += 1
-
 
 @warn_on_except
 def ping():
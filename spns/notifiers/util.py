@@ -48,7 +48,10 @@ def encrypt_notify_payload(data: dict, max_msg_size: int = 2500):
             metadata["B"] = True
             body = None
 
-    payload = bt_serialize([json.dumps(metadata), body] if body else [metadata])
+    # Compact separators: the metadata gets padded, encrypted and base64-encoded into every
+    # notification, so there's no point in shipping whitespace.
+    meta_json = json.dumps(metadata, separators=(",", ":"))
+    payload = bt_serialize([meta_json, body] if body else [meta_json])
     over = len(payload) % 256
     if over:
         payload += b"\0" * (256 - over)
@@ -96,16 +99,26 @@ class NotifyStats:
                 "+failures": self.failures,
             }
 
-            for mins in (60, 10, 1):
-                cutoff, since, summation, n = now - mins * 60, 0, 0, 0
-                for i in range(len(self.notify_hist)):
-                    t, notif = self.notify_hist[i]
-                    if t >= cutoff:
-                        if n == 0:
-                            since = self.notify_hist[i - 1 if i > 0 else i][0]
-                        n += 1
-                        summation += notif
-
+            # The history is time-ordered, so each window is a suffix of it: walk it backwards
+            # once, accumulating as we go, and close off each window (shortest first) when we hit
+            # the first entry older than its cutoff.
+            windows = [(mins, now - mins * 60) for mins in (1, 10, 60)]
+            w, summation, n, since = 0, 0, 0, now
+            for t, notif in reversed(self.notify_hist):
+                while w < len(windows) and t < windows[w][1]:
+                    if n > 0:
+                        report[f"notifies_per_day.{windows[w][0]}m"] = round(
+                            summation / n / (now - t) * 86400
+                        )
+                    w += 1
+                if w >= len(windows):
+                    break
+                n += 1
+                summation += notif
+                since = t
+
+            # Any windows still open extend back to the start of the history:
+            for mins, _ in windows[w:]:
                 if n > 0:
                     report[f"notifies_per_day.{mins}m"] = round(
                         summation / n / (now - since) * 86400
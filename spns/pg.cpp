@@ -7,8 +7,11 @@ namespace spns {
 namespace log = oxen::log;
 static auto cat = log::Cat("pg");
 
-PGConnPool::PGConnPool(std::string pg_connect, int initial_conns) :
-        pg_connect_{std::move(pg_connect)} {
+PGConnPool::PGConnPool(
+        std::string pg_connect,
+        int initial_conns,
+        std::function<void(pqxx::connection&)> on_connect) :
+        pg_connect_{std::move(pg_connect)}, on_connect_{std::move(on_connect)} {
     log::info(cat, "Connecting to postgresql database @ {}", pg_connect_);
     auto conn0 = make_conn();
     if (initial_conns > 0) {
@@ -69,7 +72,10 @@ std::unique_ptr<pqxx::connection> PGConnPool::make_conn() {
     log::debug(cat, "Creating pg connection");
     std::lock_guard lock{mutex_};
     count_++;
-    return std::make_unique<pqxx::connection>(pg_connect_);
+    auto conn = std::make_unique<pqxx::connection>(pg_connect_);
+    if (on_connect_)
+        on_connect_(*conn);
+    return conn;
 }
 
 PGConn::~PGConn() {
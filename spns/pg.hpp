@@ -1,4 +1,5 @@
 #include <chrono>
+#include <functional>
 #include <mutex>
 #include <pqxx/pqxx>
 #include <stack>
@@ -45,6 +46,7 @@ class PGConnPool {
     std::deque<std::pair<std::unique_ptr<pqxx::connection>, steady_time>> idle_conns_;
     std::mutex mutex_;
     int count_ = 0;
+    std::function<void(pqxx::connection&)> on_connect_;
 
   public:
     /// After how long of being unused before we kill off idle connections.  (This isn't an active
@@ -65,7 +67,13 @@ class PGConnPool {
     /// Create the connection pool and establish the first connection(s), throwing if we are unable
     /// to connect.  We always establish at least one connection to test the connection; if
     /// initial_conns is 0 then we close it rather than returning it to the initial pool.
-    PGConnPool(std::string pg_connect, int initial_conns = 1);
+    ///
+    /// If given, `on_connect` is invoked with each newly established connection before it gets
+    /// used; this is intended for per-connection setup such as preparing statements.
+    PGConnPool(
+            std::string pg_connect,
+            int initial_conns = 1,
+            std::function<void(pqxx::connection&)> on_connect = nullptr);
 
     /// Gets a connection; if none are available a new connection is constructed.  This tests the
     /// status of the connection before returning it, discarding any connections that are no longer